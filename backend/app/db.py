@@ -1,11 +1,145 @@
-from sqlmodel import SQLModel, create_engine, Session
+import os
 
-DB_URL = "sqlite:///./app/app.db"
-engine = create_engine(DB_URL, echo=False, connect_args={"check_same_thread": False})
+from sqlalchemy import Connection, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-def create_db_and_tables() -> None:
-    SQLModel.metadata.create_all(engine)
+from .models import AppointmentStatus
 
-def get_session():
-    with Session(engine) as session:
+# DATABASE_URL overrides the development database, e.g. so tests run against a throwaway file
+DB_URL = os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///./app/app.db")
+
+
+def _is_memory_db(url: str) -> bool:
+    return make_url(url).database in (None, "", ":memory:")
+
+
+# aiosqlite runs each connection on its own thread, so no check_same_thread override is needed.
+# Under WAL those connections read concurrently; size the pool for it rather than rely on defaults.
+# An in-memory database lives on one connection (StaticPool), which takes no pool sizing.
+engine = create_async_engine(
+    DB_URL,
+    echo=False,
+    **({} if _is_memory_db(DB_URL) else {"pool_size": 10, "max_overflow": 10}),
+)
+
+# Rows written in a request are not re-read after commit; every column is set client-side.
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# WAL lets readers proceed while a writer commits; NORMAL only fsyncs at checkpoints.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+if not _is_memory_db(DB_URL):
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
+async def create_db_and_tables() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+
+
+# Text statuses written before Appointment.status became a SMALLINT
+_LEGACY_STATUS_CODES = {
+    "confirmed": AppointmentStatus.confirmed.value,
+    "canceled": AppointmentStatus.canceled.value,
+    "cancelled": AppointmentStatus.canceled.value,
+}
+
+
+def _has_index(conn: Connection, name: str) -> bool:
+    return conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)
+    ).first() is not None
+
+
+def _upgrade_schema(conn: Connection) -> None:
+    """
+    create_all() skips tables that already exist, so a database from an older version would
+    keep its text status column and lack the unique indexes that now prevent double booking.
+    Bring it forward here, or refuse to start if its data can't satisfy those indexes.
+    """
+    if not _has_index(conn, "uq_appt_confirmed_slot"):
+        double_booked = conn.exec_driver_sql(
+            "SELECT provider_id, start, mode FROM appointment WHERE status IN ('confirmed', ?) "
+            "GROUP BY provider_id, start, mode HAVING count(*) > 1 LIMIT 1",
+            (AppointmentStatus.confirmed.value,),
+        ).first()
+        if double_booked:
+            raise RuntimeError(f"appointment table has more than one confirmed booking for slot {tuple(double_booked)}; resolve before starting")
+
+    status_type = next(row[2] for row in conn.exec_driver_sql("PRAGMA table_info(appointment)") if row[1] == "status")
+    if status_type.upper() != "SMALLINT":
+        _rebuild_appointment_table(conn)
+
+    if not _has_index(conn, "uq_hold_provider_start_mode"):
+        # Older versions left expired holds next to newer ones; keep one row per slot, a consumed one first
+        conn.exec_driver_sql(
+            "DELETE FROM slothold WHERE id IN ("
+            " SELECT id FROM (SELECT id, row_number() OVER ("
+            "  PARTITION BY provider_id, start, mode ORDER BY consumed_at IS NULL, created_at DESC) AS rn"
+            " FROM slothold) WHERE rn > 1)"
+        )
+        conn.exec_driver_sql("DROP INDEX IF EXISTS idx_hold_provider_start_mode")
+
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _rebuild_appointment_table(conn: Connection) -> None:
+    """SQLite can't change a column type in place: copy the rows into a fresh table."""
+    unknown = [
+        status for (status,) in conn.exec_driver_sql("SELECT DISTINCT status FROM appointment")
+        if status not in _LEGACY_STATUS_CODES
+    ]
+    if unknown:
+        raise RuntimeError(f"appointment table has unknown status values {unknown}; resolve before starting")
+
+    table = SQLModel.metadata.tables["appointment"]
+    old_indexes = [
+        name for (name,) in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'appointment' AND sql IS NOT NULL"
+        )
+    ]
+    for name in old_indexes:
+        conn.exec_driver_sql(f'DROP INDEX "{name}"')
+    conn.exec_driver_sql("ALTER TABLE appointment RENAME TO _appointment_old")
+    table.create(conn)
+
+    columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name != "status")
+    status_case = " ".join(f"WHEN '{text}' THEN {code}" for text, code in _LEGACY_STATUS_CODES.items())
+    conn.exec_driver_sql(
+        f"INSERT INTO appointment ({columns}, status) "
+        f"SELECT {columns}, CASE status {status_case} END FROM _appointment_old"
+    )
+    conn.exec_driver_sql("DROP TABLE _appointment_old")
+
+async def optimize_db() -> None:
+    """
+    Let SQLite refresh query-planner statistics for tables that need it.
+    Cheap when nothing changed; run periodically and on shutdown.
+    """
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA optimize")
+
+async def get_session():
+    async with SessionLocal() as session:
         yield session
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
-import difflib
-import uuid
-
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+import hashlib
+import logging
+from itertools import groupby
+from operator import attrgetter
+
+from fastapi import BackgroundTasks, FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session, select
-
-from .db import create_db_and_tables, get_session, engine
-from .models import Provider, Location, Appointment
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+import orjson
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .db import SessionLocal, create_db_and_tables, get_session, engine, optimize_db
+from .models import Provider, Location, Appointment, AppointmentStatus, ConversationEvent, RecommendationAudit
 from .schemas import (
     SearchIntentRequest, SearchIntentResponse,
     CareOptionsResponse, CareOption,
@@ -18,15 +29,47 @@ from .schemas import (
     BookAppointmentRequest, BookAppointmentResponse,
     ProviderSummary, ProvidersResponse,
     ProviderSearchResponse,
+    VisitMode,
 )
-from .services.triage import detect_red_flags
-from .services.intent import map_to_intent
+from .services.intent import classify_message
+from .services.adapter_base import epoch_seconds
 from .services.adapter_demo import DemoAdapter
-from .services.audit import log_event, log_recommendation
-from .services.holds import create_hold, consume_hold
+from .services.audit import conversation_event, log_event, recommendation_audit, write_audit_rows
+from .services.holds import cleanup_expired_holds, create_hold, consume_hold
+from .services.ids import new_id
+from .services.providers_cache import (
+    LOCATIONS, ProviderRecord,
+    booking_version, bump_booking_version, bump_version,
+    get_directory, load_locations,
+)
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded by orjson; Pydantic validation is unchanged."""
+
+    async def json(self):
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI still answers 422
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
 
 
-app = FastAPI(title="Conversational Patient Scheduling API", version="1.0.0")
+app = FastAPI(
+    title="Conversational Patient Scheduling API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
+app.router.route_class = ORJSONRoute
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
@@ -35,65 +78,136 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+logger = logging.getLogger(__name__)
+
 adapter = DemoAdapter()
 
+# Upper bound for the days query param; also bounds what the slot-window
+# and response caches can pin in memory per entry.
+MAX_DAYS = 31
+
+OPTIMIZE_INTERVAL_SECONDS = 15 * 60
+HOLD_CLEANUP_INTERVAL_SECONDS = 60
+
+CARE_OPTIONS_BASE = [
+    CareOption(provider_type="urgent_care", label="Urgent Care (same-day / acute)"),
+    CareOption(provider_type="primary_care", label="Primary Care (ongoing / general)"),
+    CareOption(provider_type="dermatology", label="Dermatology (skin)"),
+    CareOption(provider_type="orthopedics", label="Orthopedics (bones/joints)"),
+    CareOption(provider_type="cardiology", label="Cardiology (heart health)"),
+    CareOption(provider_type="neurology", label="Neurology (brain & nerves)"),
+]
+
+# Serialized /api/providers and /api/availability bodies keyed by query params + booking_version().
+_PROVIDERS_RESPONSE_CACHE: dict[tuple, tuple[bytes, str]] = {}
+_AVAILABILITY_RESPONSE_CACHE: dict[tuple, tuple[bytes, str]] = {}
+_RESPONSE_CACHE_MAX = 64
+
 
 @app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-    with Session(engine) as s:
-        if not s.exec(select(Location)).first():
-            s.add(Location(
-                id="loc_1",
-                name="Optum Clinic - Downtown",
-                address="123 Main St",
-                city="Chicago",
-                state="IL",
-                zip="60601",
-                timezone="America/Chicago",
-            ))
-            s.add(Location(
-                id="loc_2",
-                name="Optum Clinic - North",
-                address="500 North Ave",
-                city="Chicago",
-                state="IL",
-                zip="60640",
-                timezone="America/Chicago",
-            ))
-            s.commit()
-
-        providers = [
-            Provider(id="prov_1", name="Dr. Maya Patel", provider_type="primary_care", location_id="loc_1", accepts_virtual=True),
-            Provider(id="prov_2", name="Dr. James Lee", provider_type="urgent_care", location_id="loc_1", accepts_virtual=True),
-            Provider(id="prov_3", name="Dr. Sofia Kim", provider_type="dermatology", location_id="loc_2", accepts_virtual=True),
-            Provider(id="prov_4", name="Dr. Ethan Ross", provider_type="orthopedics", location_id="loc_2", accepts_virtual=False),
-            Provider(id="prov_5", name="Dr. Elena Garcia", provider_type="primary_care", location_id="loc_1", accepts_virtual=True),
-            Provider(id="prov_6", name="Dr. Marcus Chen", provider_type="primary_care", location_id="loc_2", accepts_virtual=False),
-            Provider(id="prov_7", name="Dr. Priya Nair", provider_type="cardiology", location_id="loc_1", accepts_virtual=False),
-            Provider(id="prov_8", name="Dr. Samuel Ortiz", provider_type="cardiology", location_id="loc_2", accepts_virtual=True),
-            Provider(id="prov_9", name="Dr. Hannah Schultz", provider_type="neurology", location_id="loc_1", accepts_virtual=True),
-            Provider(id="prov_10", name="Dr. Amir Rahman", provider_type="neurology", location_id="loc_2", accepts_virtual=False),
-            Provider(id="prov_11", name="Dr. John Smith", provider_type="primary_care", location_id="loc_1", accepts_virtual=True),
-            Provider(id="prov_12", name="Dr. Alicia Johnson", provider_type="primary_care", location_id="loc_2", accepts_virtual=True),
-            Provider(id="prov_13", name="Dr. Marcus Johnson", provider_type="orthopedics", location_id="loc_2", accepts_virtual=False),
-        ]
+async def on_startup():
+    await create_db_and_tables()
+
+    locations = [
+        dict(
+            id="loc_1",
+            name="Optum Clinic - Downtown",
+            address="123 Main St",
+            city="Chicago",
+            state="IL",
+            zip="60601",
+            timezone="America/Chicago",
+        ),
+        dict(
+            id="loc_2",
+            name="Optum Clinic - North",
+            address="500 North Ave",
+            city="Chicago",
+            state="IL",
+            zip="60640",
+            timezone="America/Chicago",
+        ),
+    ]
+
+    providers = [
+        dict(id="prov_1", name="Dr. Maya Patel", provider_type="primary_care", location_id="loc_1", accepts_virtual=True),
+        dict(id="prov_2", name="Dr. James Lee", provider_type="urgent_care", location_id="loc_1", accepts_virtual=True),
+        dict(id="prov_3", name="Dr. Sofia Kim", provider_type="dermatology", location_id="loc_2", accepts_virtual=True),
+        dict(id="prov_4", name="Dr. Ethan Ross", provider_type="orthopedics", location_id="loc_2", accepts_virtual=False),
+        dict(id="prov_5", name="Dr. Elena Garcia", provider_type="primary_care", location_id="loc_1", accepts_virtual=True),
+        dict(id="prov_6", name="Dr. Marcus Chen", provider_type="primary_care", location_id="loc_2", accepts_virtual=False),
+        dict(id="prov_7", name="Dr. Priya Nair", provider_type="cardiology", location_id="loc_1", accepts_virtual=False),
+        dict(id="prov_8", name="Dr. Samuel Ortiz", provider_type="cardiology", location_id="loc_2", accepts_virtual=True),
+        dict(id="prov_9", name="Dr. Hannah Schultz", provider_type="neurology", location_id="loc_1", accepts_virtual=True),
+        dict(id="prov_10", name="Dr. Amir Rahman", provider_type="neurology", location_id="loc_2", accepts_virtual=False),
+        dict(id="prov_11", name="Dr. John Smith", provider_type="primary_care", location_id="loc_1", accepts_virtual=True),
+        dict(id="prov_12", name="Dr. Alicia Johnson", provider_type="primary_care", location_id="loc_2", accepts_virtual=True),
+        dict(id="prov_13", name="Dr. Marcus Johnson", provider_type="orthopedics", location_id="loc_2", accepts_virtual=False),
+    ]
+
+    # One transaction (one fsync), one multi-row INSERT per table; rows that already exist are skipped.
+    async with SessionLocal() as s:
+        async with s.begin():
+            await s.exec(
+                sqlite_insert(Location)
+                .values(locations)
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+            await s.exec(
+                sqlite_insert(Provider)
+                .values(providers)
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+        await load_locations(s)
+
+    bump_version()
 
-        for provider in providers:
-            if not s.get(Provider, provider.id):
-                s.add(provider)
 
-        s.commit()
+async def _run_periodically(interval_seconds: float, job) -> None:
+    """Run job every interval; a failed run is logged and retried next interval, not fatal."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await job()
+        except Exception:
+            logger.exception("maintenance job %s failed", job.__name__)
+
+
+async def _cleanup_holds() -> None:
+    # Expired holds only need sweeping eventually; create_hold frees a blocking one itself.
+    async with SessionLocal() as s:
+        await cleanup_expired_holds(s)
+
+
+@app.on_event("startup")
+async def start_maintenance():
+    app.state.maintenance_tasks = [
+        asyncio.create_task(_run_periodically(OPTIMIZE_INTERVAL_SECONDS, optimize_db)),
+        asyncio.create_task(_run_periodically(HOLD_CLEANUP_INTERVAL_SECONDS, _cleanup_holds)),
+    ]
+
+
+@app.on_event("shutdown")
+async def stop_maintenance():
+    for task in app.state.maintenance_tasks:
+        task.cancel()
+    # wait until they have actually stopped before the final optimize and engine disposal
+    await asyncio.gather(*app.state.maintenance_tasks, return_exceptions=True)
+    await optimize_db()
+    await engine.dispose()
 
 
 @app.post("/api/search-intent", response_model=SearchIntentResponse)
-def search_intent(req: SearchIntentRequest, session: Session = Depends(get_session)):
-    log_event(session, req.session_id, "user_message", {"text": req.message})
+async def search_intent(req: SearchIntentRequest, background: BackgroundTasks):
+    # The response doesn't depend on the audit trail: each return hands the finished rows
+    # to a background task that writes them after the response goes out.
+    audit_rows: list[ConversationEvent | RecommendationAudit] = [conversation_event(req.session_id, "user_message", {"text": req.message})]
 
-    flag = detect_red_flags(req.message)
+    flag, intent = classify_message(req.message)
     if flag:
         msg = f"{flag} If you think this may be an emergency, call 911 or go to the nearest ER."
-        log_event(session, req.session_id, "escalated", {"reason": "red_flag", "message": msg})
+        audit_rows.append(conversation_event(req.session_id, "escalated", {"reason": "red_flag", "message": msg}))
+        background.add_task(write_audit_rows, audit_rows)
         return SearchIntentResponse(
             escalate=True,
             safety_message=msg,
@@ -101,7 +215,6 @@ def search_intent(req: SearchIntentRequest, session: Session = Depends(get_sessi
             follow_up_questions=[],
         )
 
-    intent = map_to_intent(req.message)
     confidence = intent["confidence"]
 
     follow_ups = []
@@ -113,17 +226,19 @@ def search_intent(req: SearchIntentRequest, session: Session = Depends(get_sessi
         ]
 
     rationale = f"Mapped symptoms to visit_reason_code={intent['visit_reason_code']} and suggested {intent['recommended_provider_type']}."
-    log_recommendation(
-        session,
-        req.session_id,
-        intent["recommended_provider_type"],
-        intent["visit_reason_code"],
-        rationale=rationale,
-        confidence=confidence,
+    audit_rows.append(
+        recommendation_audit(
+            req.session_id,
+            intent["recommended_provider_type"],
+            intent["visit_reason_code"],
+            rationale=rationale,
+            confidence=confidence,
+        )
     )
 
     assistant_text = f"I can help you schedule for {intent['visit_reason_label']}. Choose a care type and then pick a time."
-    log_event(session, req.session_id, "assistant_message", {"text": assistant_text})
+    audit_rows.append(conversation_event(req.session_id, "assistant_message", {"text": assistant_text}))
+    background.add_task(write_audit_rows, audit_rows)
 
     return SearchIntentResponse(
         escalate=False,
@@ -137,24 +252,47 @@ def search_intent(req: SearchIntentRequest, session: Session = Depends(get_sessi
 
 
 @app.get("/api/care-options", response_model=CareOptionsResponse)
-def care_options(visit_reason_code: str, recommended_provider_type: str):
-    options = [
-        CareOption(provider_type="urgent_care", label="Urgent Care (same-day / acute)", suggested=(recommended_provider_type == "urgent_care")),
-        CareOption(provider_type="primary_care", label="Primary Care (ongoing / general)", suggested=(recommended_provider_type == "primary_care")),
-        CareOption(provider_type="dermatology", label="Dermatology (skin)", suggested=(recommended_provider_type == "dermatology")),
-        CareOption(provider_type="orthopedics", label="Orthopedics (bones/joints)", suggested=(recommended_provider_type == "orthopedics")),
-        CareOption(provider_type="cardiology", label="Cardiology (heart health)", suggested=(recommended_provider_type == "cardiology")),
-        CareOption(provider_type="neurology", label="Neurology (brain & nerves)", suggested=(recommended_provider_type == "neurology")),
-    ]
-    if visit_reason_code == "GENERIC_TRIAGE":
-        for o in options:
-            o.suggested = (o.provider_type == "primary_care")
-    return CareOptionsResponse(options=options)
+async def care_options(visit_reason_code: str, recommended_provider_type: str, request: Request):
+    suggested_type = "primary_care" if visit_reason_code == "GENERIC_TRIAGE" else recommended_provider_type
+    return _json_with_etag(request, *_care_options_body(suggested_type), cache_control="public, max-age=60")
+
 
+@lru_cache(maxsize=64)
+def _care_options_body(suggested_type: str) -> tuple[bytes, str]:
+    """Serialized body + ETag; the response is a pure function of the suggested type."""
+    body = CareOptionsResponse(
+        options=[o.model_copy(update={"suggested": o.provider_type == suggested_type}) for o in CARE_OPTIONS_BASE]
+    ).model_dump_json().encode()
+    return body, _etag_for(body)
 
-def summarize_providers(
-    providers: list[Provider],
-    session: Session,
+
+def _etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def _json_with_etag(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _cache_body(cache: dict[tuple, tuple[bytes, str]], key: tuple, body: bytes) -> tuple[bytes, str]:
+    """Store body + ETag under key; a full cache is simply dropped (old keys die with booking_version())."""
+    if len(cache) >= _RESPONSE_CACHE_MAX:
+        cache.clear()
+    cache[key] = (body, _etag_for(body))
+    return cache[key]
+
+
+def _booking_window(start: date, days: int) -> tuple[datetime, datetime]:
+    """[start, end) datetimes covering the days an availability request can return."""
+    return datetime.combine(start, time.min), datetime.combine(start + timedelta(days=days), time.min)
+
+
+async def summarize_providers(
+    providers: list[ProviderRecord],
+    session: AsyncSession,
     mode: str | None,
     start: date,
     days: int,
@@ -163,14 +301,31 @@ def summarize_providers(
         return []
 
     providers = sorted(providers, key=lambda p: p.name)
-    locs = {l.id: l for l in session.exec(select(Location)).all()}
-    booked_rows = session.exec(
-        select(Appointment).where(
+    locs = LOCATIONS
+    window_start, window_end = _booking_window(start, days)
+    # Column projection: the booked set only needs these three fields, no ORM rows
+    booked_rows = (await session.exec(
+        select(Appointment.provider_id, Appointment.start, Appointment.mode).where(
             Appointment.provider_id.in_([p.id for p in providers]),
-            Appointment.status == "confirmed",
+            Appointment.status == AppointmentStatus.confirmed,
+            Appointment.start >= window_start,
+            Appointment.start < window_end,
         )
-    ).all()
-    booked = {(b.provider_id, b.start, b.mode) for b in booked_rows}
+    )).all()
+    booked: dict[str, set[tuple[int, str]]] = defaultdict(set)
+    for provider_id, booked_start, booked_mode in booked_rows:
+        booked[provider_id].add((epoch_seconds(booked_start), booked_mode))
+
+    if mode:
+        modes = [mode]
+    else:
+        modes = ["in_person"] + (["virtual"] if any(p.accepts_virtual for p in providers) else [])
+
+    # One adapter call for every provider and mode; slots arrive grouped per provider, sorted by start
+    slots = adapter.generate_availability([p.id for p in providers], start, days, modes)  # type: ignore[arg-type]
+    slots_by_provider = {
+        pid: list(group) for pid, group in groupby(slots, key=attrgetter("provider_id"))
+    }
 
     summaries: list[ProviderSummary] = []
     for p in providers:
@@ -178,23 +333,16 @@ def summarize_providers(
         if not loc:
             continue
 
-        mode_choices: list[str] = []
-        if mode:
-            mode_choices.append(mode)
-        else:
-            mode_choices.append("in_person")
-            if p.accepts_virtual:
-                mode_choices.append("virtual")
-
-        candidates = []
-        for m in mode_choices:
-            slots = adapter.generate_availability([p.id], start, days, m)  # type: ignore[arg-type]
-            for s in slots:
-                if (p.id, s.start, s.mode) in booked:
-                    continue
-                candidates.append(s)
-
-        next_slot = min(candidates, key=lambda s: s.start) if candidates else None
+        provider_booked = booked[p.id]
+        # Without an explicit mode, only offer virtual for providers that accept it
+        next_slot = next(
+            (
+                s for s in slots_by_provider.get(p.id, [])
+                if (mode or s.mode == "in_person" or p.accepts_virtual)
+                and (s.start_epoch, s.mode) not in provider_booked
+            ),
+            None,
+        )
 
         summaries.append(
             ProviderSummary(
@@ -214,37 +362,46 @@ def summarize_providers(
 
 
 @app.get("/api/providers", response_model=ProvidersResponse)
-def provider_directory(
+async def provider_directory(
+    request: Request,
     provider_type: str | None = None,
     limit: int = 5,
     mode: str | None = None,
     start_date: date | None = None,
-    days: int = 14,
-    session: Session = Depends(get_session),
+    days: int = Query(14, ge=1, le=MAX_DAYS),
+    session: AsyncSession = Depends(get_session),
 ):
     start = start_date or date.today()
 
-    query = select(Provider)
-    if provider_type:
-        query = query.where(Provider.provider_type == provider_type)
+    # Any booking bumps booking_version(), so stale next-available times are never served.
+    # no-cache: clients revalidate with If-None-Match and get a cheap 304 while nothing changed.
+    cache_key = (provider_type, limit, mode, start.toordinal(), days, booking_version())
+    cached = _PROVIDERS_RESPONSE_CACHE.get(cache_key)
+    if cached:
+        return _json_with_etag(request, *cached, cache_control="no-cache")
 
-    providers = session.exec(query).all()
+    directory = await get_directory(session)
+    if provider_type:
+        providers = directory.providers_by_type.get(provider_type, [])
+    else:
+        providers = directory.providers
     providers = providers[:limit]
 
-    summaries = summarize_providers(providers, session, mode, start, days)
+    summaries = await summarize_providers(providers, session, mode, start, days)
 
-    return ProvidersResponse(providers=summaries)
+    body = ProvidersResponse(providers=summaries).model_dump_json().encode()
+    return _json_with_etag(request, *_cache_body(_PROVIDERS_RESPONSE_CACHE, cache_key, body), cache_control="no-cache")
 
 
 @app.get("/api/provider-search", response_model=ProviderSearchResponse)
-def provider_search(
+async def provider_search(
     q: str,
     provider_type: str | None = None,
     limit: int = 5,
     mode: str | None = None,
     start_date: date | None = None,
-    days: int = 14,
-    session: Session = Depends(get_session),
+    days: int = Query(14, ge=1, le=MAX_DAYS),
+    session: AsyncSession = Depends(get_session),
 ):
     start = start_date or date.today()
     normalized_query = q.strip().lower()
@@ -252,95 +409,102 @@ def provider_search(
     if not normalized_query:
         return ProviderSearchResponse(providers=[], suggestions=[])
 
-    query = select(Provider)
+    directory = await get_directory(session)
     if provider_type:
-        query = query.where(Provider.provider_type == provider_type)
-
-    providers = session.exec(query).all()
+        providers = directory.providers_by_type.get(provider_type, [])
+    else:
+        providers = directory.providers
+    name_index = directory.last_name_indexes.get(provider_type or None)
 
     direct_matches = [
-        p for p in providers if normalized_query in p.name.lower()
+        p for p in providers if normalized_query in p.name_lower
     ][:limit]
+    direct_ids = {p.id for p in direct_matches}
 
-    if len(direct_matches) < limit:
-        last_name_map = {p.id: p.name.split()[-1].lower() for p in providers}
+    if len(direct_matches) < limit and name_index:
         # Prefer prefix matches on last name for typeahead behavior
-        last_name_candidates = [
-            p for p in providers
-            if last_name_map[p.id].startswith(normalized_query)
-        ]
+        prefix_ids = name_index.prefix(normalized_query)
+        last_name_candidates = [p for p in providers if p.id in prefix_ids]
 
         if not last_name_candidates:
-            close_last_names = set(
-                difflib.get_close_matches(
-                    normalized_query, list(last_name_map.values()), n=5, cutoff=0.6
-                )
-            )
+            close_last_names = name_index.close(normalized_query)
             last_name_candidates = [
-                p for p in providers if last_name_map[p.id] in close_last_names
+                p for p in providers if p.last_name_lower in close_last_names
             ]
 
-        suggestion_pool = [p for p in last_name_candidates if p not in direct_matches]
+        suggestion_pool = [p for p in last_name_candidates if p.id not in direct_ids]
         suggestions = suggestion_pool[: max(0, limit - len(direct_matches))]
     else:
         suggestions = []
 
-    summaries = summarize_providers(direct_matches, session, mode, start, days)
-    suggestion_summaries = summarize_providers(suggestions, session, mode, start, days)
+    # One summarize pass (one booked-appointments query) for both lists, split back by id;
+    # summaries are name-sorted, so each half keeps its order.
+    all_summaries = await summarize_providers(direct_matches + suggestions, session, mode, start, days)
 
-    return ProviderSearchResponse(providers=summaries, suggestions=suggestion_summaries)
+    return ProviderSearchResponse(
+        providers=[s for s in all_summaries if s.provider_id in direct_ids],
+        suggestions=[s for s in all_summaries if s.provider_id not in direct_ids],
+    )
 
 
 @app.get("/api/availability", response_model=AvailabilityResponse)
-def availability(
+async def availability(
+    request: Request,
     provider_type: str,
     start_date: date | None = None,
-    days: int = 7,
-    mode: str = "in_person",
+    days: int = Query(7, ge=1, le=MAX_DAYS),
+    mode: VisitMode = "in_person",
     visit_reason_code: str = "GENERIC_TRIAGE",
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     start = start_date or date.today()
 
-    providers = session.exec(
-        select(Provider).where(Provider.provider_type == provider_type)
-    ).all()
+    # Same invalidation as /api/providers: a booking bumps booking_version().
+    # Holds don't hide slots here, and visit_reason_code doesn't change the grid.
+    cache_key = (provider_type, start.toordinal(), days, mode, booking_version())
+    cached = _AVAILABILITY_RESPONSE_CACHE.get(cache_key)
+    if cached:
+        return _json_with_etag(request, *cached, cache_control="no-cache")
+
+    directory = await get_directory(session)
+    providers = directory.providers_by_type.get(provider_type, [])
 
-    # IMPORTANT: always return a valid response model (never None)
+    # IMPORTANT: always return a valid response model (never None); cached and ETagged like any other
     if not providers:
-        return AvailabilityResponse(slots=[])
+        body = AvailabilityResponse.model_construct(slots=[]).model_dump_json().encode()
+        return _json_with_etag(request, *_cache_body(_AVAILABILITY_RESPONSE_CACHE, cache_key, body), cache_control="no-cache")
 
-    provider_ids = [p.id for p in providers]
+    # Join provider -> location once per provider, not per slot
+    locs = LOCATIONS
+    resolved = {p.id: (p, locs[p.location_id]) for p in providers if p.location_id in locs}
+    provider_ids = list(resolved)
 
-    slots = adapter.generate_availability(provider_ids, start, days, mode)  # type: ignore
+    slots = adapter.generate_availability(provider_ids, start, days, [mode])
 
-    booked = session.exec(
-        select(Appointment).where(
+    window_start, window_end = _booking_window(start, days)
+    booked = (await session.exec(
+        select(Appointment.provider_id, Appointment.start).where(
             Appointment.provider_id.in_(provider_ids),
-            Appointment.status == "confirmed",
-            Appointment.mode == mode,  # type: ignore
+            Appointment.mode == mode,
+            Appointment.status == AppointmentStatus.confirmed,
+            Appointment.start >= window_start,
+            Appointment.start < window_end,
         )
-    ).all()
-    booked_keys = {(b.provider_id, b.start, b.mode) for b in booked}
-
-    locs = {l.id: l for l in session.exec(select(Location)).all()}
-    provider_by_id = {p.id: p for p in providers}
+    )).all()
+    # mode is fixed by the query, so per-provider start times are enough
+    booked_starts: dict[str, set[int]] = defaultdict(set)
+    for provider_id, booked_start in booked:
+        booked_starts[provider_id].add(epoch_seconds(booked_start))
 
     out: list[AvailabilityResponseSlot] = []
-    for s in slots:
-        if (s.provider_id, s.start, s.mode) in booked_keys:
-            continue
-
-        p = provider_by_id.get(s.provider_id)
-        if not p:
-            continue
-        loc = locs.get(p.location_id)
-        if not loc:
-            continue
-
-        out.append(
-            AvailabilityResponseSlot(
-                provider_id=p.id,
+    # Slots arrive grouped per provider, so each group shares one resolved provider/location
+    for pid, group in groupby(slots, key=attrgetter("provider_id")):
+        p, loc = resolved[pid]
+        provider_booked = booked_starts[pid]
+        # Every field is server-built from typed records; skip per-field validation
+        out.extend(
+            AvailabilityResponseSlot.model_construct(
+                provider_id=pid,
                 provider_name=p.name,
                 location_id=p.location_id,
                 location_name=loc.name,
@@ -348,24 +512,28 @@ def availability(
                 end=s.end,
                 mode=s.mode,
             )
+            for s in group
+            if s.start_epoch not in provider_booked
         )
 
     out.sort(key=lambda s: (s.start, s.provider_id))
 
-    return AvailabilityResponse(slots=out)
+    # Returning the serialized body directly also skips FastAPI's response_model re-validation
+    body = AvailabilityResponse.model_construct(slots=out).model_dump_json().encode()
+    return _json_with_etag(request, *_cache_body(_AVAILABILITY_RESPONSE_CACHE, cache_key, body), cache_control="no-cache")
 
 
 @app.post("/api/holds", response_model=CreateHoldResponse)
-def hold_slot(
+async def hold_slot(
     req: CreateHoldRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
-    provider = session.get(Provider, req.provider_id)
+    provider = await session.get(Provider, req.provider_id)
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
     try:
-        hold = create_hold(
+        hold = await create_hold(
             session=session,
             provider_id=req.provider_id,
             location_id=provider.location_id,
@@ -377,12 +545,13 @@ def hold_slot(
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
-    log_event(
+    await log_event(
         session,
         req.session_id,
         "hold_created",
-        {"hold_id": hold.id, "provider_id": hold.provider_id, "start": hold.start.isoformat()},
+        {"hold_id": hold.id, "provider_id": hold.provider_id, "start": hold.start},
     )
+    await session.commit()
 
     return CreateHoldResponse(
         hold_id=hold.id,
@@ -391,22 +560,22 @@ def hold_slot(
 
 
 @app.post("/api/appointments", response_model=BookAppointmentResponse)
-def book(
+async def book(
     req: BookAppointmentRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     try:
-        hold = consume_hold(session, req.hold_id)
+        hold = await consume_hold(session, req.hold_id)
     except (KeyError, ValueError) as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    provider = session.get(Provider, hold.provider_id)
-    location = session.get(Location, hold.location_id)
+    provider = await session.get(Provider, hold.provider_id)
+    location = await session.get(Location, hold.location_id)
     if not provider or not location:
         raise HTTPException(status_code=500, detail="Provider/location missing for hold")
 
     appt = Appointment(
-        id="appt_" + uuid.uuid4().hex[:12],
+        id=new_id("appt"),
         provider_id=hold.provider_id,
         location_id=hold.location_id,
         start=hold.start,
@@ -419,19 +588,35 @@ def book(
         patient_phone=req.patient_phone,
         patient_email=req.patient_email,
         notes=req.notes,
-        status="confirmed",
+        status=AppointmentStatus.confirmed,
     )
     session.add(appt)
-    session.commit()
-    session.refresh(appt)
-
-    log_event(
+    await log_event(
         session,
         req.session_id,
         "appointment_booked",
         {"appointment_id": appt.id},
     )
 
+    # hold consumption, appointment and audit row commit together
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        # Only uq_appt_confirmed_slot means the slot is taken; any other constraint failure is a bug
+        taken = (await session.exec(
+            select(Appointment.id).where(
+                Appointment.provider_id == appt.provider_id,
+                Appointment.start == appt.start,
+                Appointment.mode == appt.mode,
+                Appointment.status == AppointmentStatus.confirmed,
+            )
+        )).first()
+        if taken:
+            raise HTTPException(status_code=409, detail="Slot already booked")
+        raise
+    bump_booking_version()
+
     return BookAppointmentResponse(
         appointment_id=appt.id,
         provider_name=provider.name,
@@ -439,5 +624,5 @@ def book(
         start=appt.start,
         end=appt.end,
         mode=appt.mode,
-        status="confirmed",
+        status=AppointmentStatus(appt.status).name,
     )
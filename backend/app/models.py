@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime, date
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Optional
+from sqlalchemy import Column, SmallInteger
 from sqlmodel import SQLModel, Field, Index
 
 
@@ -20,6 +21,12 @@ class VisitMode(str, Enum):
     virtual = "virtual"
 
 
+class AppointmentStatus(IntEnum):
+    """Stored as SMALLINT; the API exposes the member name (e.g. "confirmed")."""
+    confirmed = 1
+    canceled = 2
+
+
 class Location(SQLModel, table=True):
     id: str = Field(primary_key=True)
     name: str
@@ -54,11 +61,22 @@ class Appointment(SQLModel, table=True):
     patient_email: Optional[str] = None
     notes: Optional[str] = None
 
-    status: str = "confirmed"
+    status: int = Field(
+        default=AppointmentStatus.confirmed,
+        sa_column=Column(SmallInteger, nullable=False),
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 Index("idx_appt_provider_start_mode", Appointment.provider_id, Appointment.start, Appointment.mode)
+Index("idx_appt_provider_mode_status_start", Appointment.provider_id, Appointment.mode, Appointment.status, Appointment.start)
+# at most one confirmed appointment per slot
+Index(
+    "uq_appt_confirmed_slot",
+    Appointment.provider_id, Appointment.start, Appointment.mode,
+    unique=True,
+    sqlite_where=Appointment.status == AppointmentStatus.confirmed,
+)
 
 
 class SlotHold(SQLModel, table=True):
@@ -75,7 +93,8 @@ class SlotHold(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-Index("idx_hold_provider_start_mode", SlotHold.provider_id, SlotHold.start, SlotHold.mode)
+# one hold row per slot; holds.create_hold relies on this to reject concurrent holds
+Index("uq_hold_provider_start_mode", SlotHold.provider_id, SlotHold.start, SlotHold.mode, unique=True)
 
 
 class ConversationEvent(SQLModel, table=True):
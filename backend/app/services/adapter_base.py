@@ -1,20 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, date
-from typing import List, Protocol, Literal
+from datetime import datetime, date, timedelta
+from typing import List, NamedTuple, Protocol, Literal, Sequence
 
 VisitMode = Literal["in_person", "virtual"]
 
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
 
-@dataclass(frozen=True)
-class AvailabilitySlot:
+
+def epoch_seconds(dt: datetime) -> int:
+    """Integer seconds since 1970-01-01 for naive datetimes (cheap hash/compare key)."""
+    return (dt - _EPOCH) // _ONE_SECOND
+
+
+class AvailabilitySlot(NamedTuple):
+    # NamedTuple: immutable and cheaper to build than a frozen dataclass, at hundreds per request
     provider_id: str
     start: datetime
     end: datetime
     mode: VisitMode
+    start_epoch: int  # epoch_seconds(start), precomputed by the adapter
 
 
 class SchedulingAdapter(Protocol):
-    def generate_availability(self, provider_ids: List[str], start_date: date, days: int, mode: VisitMode) -> List[AvailabilitySlot]:
+    def generate_availability(self, provider_ids: List[str], start_date: date, days: int, modes: Sequence[VisitMode]) -> List[AvailabilitySlot]:
+        """
+        One call covers every provider and every requested mode.
+        Result is ordered by (provider, start, mode), following the input orders.
+        """
         ...
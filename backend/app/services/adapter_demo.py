@@ -1,12 +1,44 @@
 from __future__ import annotations
 
 from datetime import date, datetime, time, timedelta
-from typing import List, Literal
+from functools import lru_cache
+from typing import List, Literal, Sequence, Tuple
 
-from .adapter_base import AvailabilitySlot, SchedulingAdapter
+from .adapter_base import AvailabilitySlot, SchedulingAdapter, epoch_seconds
 
 VisitMode = Literal["in_person", "virtual"]
 
+SLOT_MINUTES = 30
+DAY_START_MINUTES = 9 * 60
+DAY_END_MINUTES = 17 * 60  # end boundary; last slot starts at 16:30
+
+# Weekday template built once: (start offset, end offset, start offset in seconds) from midnight.
+_SLOT_TEMPLATE: Tuple[Tuple[timedelta, timedelta, int], ...] = tuple(
+    (timedelta(minutes=m), timedelta(minutes=m + SLOT_MINUTES), m * 60)
+    for m in range(DAY_START_MINUTES, DAY_END_MINUTES - SLOT_MINUTES + 1, SLOT_MINUTES)
+)
+
+
+@lru_cache(maxsize=64)
+def _slot_windows(start_date: date, days: int) -> Tuple[Tuple[datetime, datetime, int], ...]:
+    """(start, end, start epoch seconds) for every weekday slot in the range; provider-independent."""
+    windows: List[Tuple[datetime, datetime, int]] = []
+
+    for day_offset in range(days):
+        d = start_date + timedelta(days=day_offset)
+        # 0=Mon ... 6=Sun
+        if d.weekday() >= 5:
+            continue
+
+        day_base = datetime.combine(d, time.min)
+        base_ts = epoch_seconds(day_base)
+        windows.extend(
+            (day_base + start_off, day_base + end_off, base_ts + start_secs)
+            for start_off, end_off, start_secs in _SLOT_TEMPLATE
+        )
+
+    return tuple(windows)
+
 
 class DemoAdapter(SchedulingAdapter):
     """
@@ -16,30 +48,15 @@ class DemoAdapter(SchedulingAdapter):
     - 9:00–16:30 local time (last start at 16:30)
     """
 
-    def generate_availability(self, provider_ids: List[str], start_date: date, days: int, mode: VisitMode) -> List[AvailabilitySlot]:
-        slots: List[AvailabilitySlot] = []
-
-        for day_offset in range(days):
-            d = start_date + timedelta(days=day_offset)
-            # 0=Mon ... 6=Sun
-            if d.weekday() >= 5:
-                continue
-
-            start_t = time(9, 0)
-            end_t = time(17, 0)  # end boundary
-            cursor = datetime.combine(d, start_t)
-            end_boundary = datetime.combine(d, end_t)
-
-            while cursor < end_boundary:
-                slot_end = cursor + timedelta(minutes=30)
-                if slot_end <= end_boundary:
-                    for pid in provider_ids:
-                        slots.append(AvailabilitySlot(
-                            provider_id=pid,
-                            start=cursor,
-                            end=slot_end,
-                            mode=mode,
-                        ))
-                cursor = slot_end
-
-        return slots
+    def generate_availability(self, provider_ids: List[str], start_date: date, days: int, modes: Sequence[VisitMode]) -> List[AvailabilitySlot]:
+        """
+        Slots come back grouped by provider (in provider_ids order), then sorted by start,
+        then by mode (in modes order). Callers rely on this to take the first free slot.
+        """
+        windows = _slot_windows(start_date, days)
+        return [
+            AvailabilitySlot(pid, slot_start, slot_end, mode, start_epoch)
+            for pid in provider_ids
+            for slot_start, slot_end, start_epoch in windows
+            for mode in modes
+        ]
@@ -1,50 +1,62 @@
 from __future__ import annotations
 
-import json
-import uuid
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
 
-from sqlmodel import Session
+import orjson
 
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..db import SessionLocal
 from ..models import ConversationEvent, RecommendationAudit, ProviderType
+from .ids import new_id
 
 
-def log_event(session: Session, session_id: str, event_type: str, payload: Dict[str, Any]) -> None:
+def conversation_event(session_id: str, event_type: str, payload: Dict[str, Any]) -> ConversationEvent:
     """
-    Append-only audit log for conversation + user actions.
-    Stored as JSON string for flexibility.
+    Append-only audit log row for conversation + user actions.
+    Stored as JSON string for flexibility (orjson: UTF-8, datetimes as ISO 8601).
     """
-    ev = ConversationEvent(
-        id="evt_" + uuid.uuid4().hex[:12],
+    return ConversationEvent(
+        id=new_id("evt"),
         session_id=session_id,
         event_type=event_type,
-        payload_json=json.dumps(payload, ensure_ascii=False),
+        payload_json=orjson.dumps(payload).decode(),
     )
-    session.add(ev)
-    session.commit()
 
 
-def log_recommendation(
-    session: Session,
+def recommendation_audit(
     session_id: str,
     recommended_provider_type: str | ProviderType,
     visit_reason_code: str,
     rationale: str,
     confidence: str,
-) -> None:
+) -> RecommendationAudit:
     """
-    Audit record for clinical-routing recommendation (non-clinical, deterministic mapping here).
+    Audit row for clinical-routing recommendation (non-clinical, deterministic mapping here).
     """
     # Allow passing either raw string or enum
     rpt = recommended_provider_type.value if isinstance(recommended_provider_type, ProviderType) else recommended_provider_type
 
-    rec = RecommendationAudit(
-        id="rec_" + uuid.uuid4().hex[:12],
+    return RecommendationAudit(
+        id=new_id("rec"),
         session_id=session_id,
         recommended_provider_type=rpt,  # SQLModel will coerce to enum
         visit_reason_code=visit_reason_code,
         rationale=rationale,
         confidence=confidence,
     )
-    session.add(rec)
-    session.commit()
+
+
+async def log_event(session: AsyncSession, session_id: str, event_type: str, payload: Dict[str, Any]) -> None:
+    """Does not commit: the row goes out with the caller's transaction."""
+    session.add(conversation_event(session_id, event_type, payload))
+
+
+async def write_audit_rows(rows: Sequence[ConversationEvent | RecommendationAudit]) -> None:
+    """
+    Persist audit rows in their own session and one commit.
+    For endpoints that write nothing else: run it as a background task, after the response is sent.
+    """
+    async with SessionLocal() as session:
+        session.add_all(rows)
+        await session.commit()
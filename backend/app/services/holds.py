@@ -1,24 +1,29 @@
 from __future__ import annotations
 
-import uuid
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlmodel import Session, select
-from ..models import SlotHold, Appointment
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..models import SlotHold
 
 HOLD_TTL_MINUTES = 5
 
-def cleanup_expired_holds(session: Session) -> int:
-    now = datetime.utcnow()
-    stmt = select(SlotHold).where(SlotHold.expires_at < now, SlotHold.consumed_at.is_(None))
-    holds = session.exec(stmt).all()
-    for h in holds:
-        session.delete(h)
-    session.commit()
-    return len(holds)
+async def cleanup_expired_holds(session: AsyncSession) -> int:
+    """Single bulk DELETE; run periodically from the app, not per request."""
+    result = await session.exec(
+        delete(SlotHold).where(SlotHold.expires_at < datetime.utcnow(), SlotHold.consumed_at.is_(None))
+    )
+    await session.commit()
+    return result.rowcount
+
+def _slot_clause(provider_id: str, start: datetime, mode: str):
+    return (SlotHold.provider_id == provider_id, SlotHold.start == start, SlotHold.mode == mode)
 
-def create_hold(
-    session: Session,
+async def create_hold(
+    session: AsyncSession,
     provider_id: str,
     location_id: str,
     start: datetime,
@@ -26,51 +31,51 @@ def create_hold(
     mode: str,
     visit_reason_code: str,
 ) -> SlotHold:
-    cleanup_expired_holds(session)
-
-    # prevent holding if already booked
-    booked = session.exec(
-        select(Appointment).where(
-            Appointment.provider_id == provider_id,
-            Appointment.start == start,
-            Appointment.mode == mode,
-            Appointment.status == "confirmed",
+    """
+    The unique (provider_id, start, mode) index on SlotHold arbitrates concurrent holds:
+    the INSERT either wins the slot or fails atomically. A consumed hold keeps its row,
+    so a booked slot can never be held again.
+    The hold is flushed, not committed; the caller commits it with its audit rows.
+    """
+    for attempt in range(2):
+        hold = SlotHold(
+            # random, not time-ordered: a hold id is all book() needs to claim the slot
+            id="hold_" + secrets.token_hex(6),
+            provider_id=provider_id,
+            location_id=location_id,
+            start=start,
+            end=end,
+            mode=mode,  # type: ignore
+            visit_reason_code=visit_reason_code,
+            expires_at=datetime.utcnow() + timedelta(minutes=HOLD_TTL_MINUTES),
         )
-    ).first()
-    if booked:
-        raise ValueError("Slot already booked")
+        session.add(hold)
+        try:
+            await session.flush()
+            return hold
+        except IntegrityError:
+            await session.rollback()
 
-    # prevent multiple active holds for same slot
-    active_hold = session.exec(
-        select(SlotHold).where(
-            SlotHold.provider_id == provider_id,
-            SlotHold.start == start,
-            SlotHold.mode == mode,
-            SlotHold.consumed_at.is_(None),
-            SlotHold.expires_at > datetime.utcnow(),
-        )
-    ).first()
-    if active_hold:
-        raise ValueError("Slot is currently on hold")
+        if attempt == 0:
+            # The row in the way may be an expired, unconsumed hold; release it and retry once.
+            released = await session.exec(
+                delete(SlotHold).where(
+                    *_slot_clause(provider_id, start, mode),
+                    SlotHold.consumed_at.is_(None),
+                    SlotHold.expires_at <= datetime.utcnow(),
+                )
+            )
+            if not released.rowcount:
+                break
 
-    hold = SlotHold(
-        id="hold_" + uuid.uuid4().hex[:12],
-        provider_id=provider_id,
-        location_id=location_id,
-        start=start,
-        end=end,
-        mode=mode,  # type: ignore
-        visit_reason_code=visit_reason_code,
-        expires_at=datetime.utcnow() + timedelta(minutes=HOLD_TTL_MINUTES),
-    )
-    session.add(hold)
-    session.commit()
-    session.refresh(hold)
-    return hold
+    # Failure path only: say why the slot is taken
+    existing = (await session.exec(select(SlotHold).where(*_slot_clause(provider_id, start, mode)))).first()
+    if existing and existing.consumed_at is not None:
+        raise ValueError("Slot already booked")
+    raise ValueError("Slot is currently on hold")
 
-def consume_hold(session: Session, hold_id: str) -> SlotHold:
-    cleanup_expired_holds(session)
-    hold = session.get(SlotHold, hold_id)
+async def consume_hold(session: AsyncSession, hold_id: str) -> SlotHold:
+    hold = await session.get(SlotHold, hold_id)
     if not hold:
         raise KeyError("Hold not found")
     if hold.consumed_at is not None:
@@ -79,6 +84,5 @@ def consume_hold(session: Session, hold_id: str) -> SlotHold:
         raise ValueError("Hold expired")
     hold.consumed_at = datetime.utcnow()
     session.add(hold)
-    session.commit()
-    session.refresh(hold)
+    # not committed: book() commits the consumption together with the appointment
     return hold
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import secrets
+from time import time_ns
+
+
+def new_id(prefix: str) -> str:
+    """
+    "<prefix>_" + 11 hex digits of epoch milliseconds + 20 random hex digits (80 bits, as in a ULID).
+    Ids sort by creation time, so inserts land at the right edge of the primary-key B-tree.
+    One request writes several ids within the same millisecond, so the random part alone
+    has to keep them unique. Not a secret; one small urandom read instead of building a uuid4.
+    """
+    return f"{prefix}_{time_ns() // 1_000_000:011x}{secrets.token_hex(10)}"
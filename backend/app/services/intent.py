@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from .triage import RED_FLAG_PATTERNS, fused_alternation, lowest_match
 
 # Very small, deterministic "intent mapping" (no external APIs)
 # Output shape is used by app/main.py
@@ -25,16 +27,50 @@ _RULES = [
 ]
 
 
+_FALLBACK_INTENT = {
+    "visit_reason_code": "GENERIC_TRIAGE",
+    "visit_reason_label": "a health concern",
+    "recommended_provider_type": "primary_care",
+    "confidence": "low",
+}
+
+
+# All rules fused so the message is scanned once; the lowest index found still wins,
+# as with the sequential scan.
+_RULES_RX = re.compile(fused_alternation("r", [rx for rx, _ in _RULES]), re.I)
+
+
 def map_to_intent(message: str) -> Dict[str, Any]:
-    text = (message or "").strip()
-    for rx, payload in _RULES:
-        if rx.search(text):
-            return dict(payload)
-
-    # fallback
-    return {
-        "visit_reason_code": "GENERIC_TRIAGE",
-        "visit_reason_label": "a health concern",
-        "recommended_provider_type": "primary_care",
-        "confidence": "low",
-    }
+    best = lowest_match(_RULES_RX, (message or "").strip())
+    if best is not None:
+        return dict(_RULES[best][1])
+    return dict(_FALLBACK_INTENT)
+
+
+# Red flags and intent rules in one fused scan, red flags first.
+_MESSAGE_RX = re.compile(
+    fused_alternation("f", [rx for rx, _ in RED_FLAG_PATTERNS]) + "|" + fused_alternation("r", [rx for rx, _ in _RULES]),
+    re.I,
+)
+
+
+def classify_message(message: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    detect_red_flags() and map_to_intent() in a single scan of the message.
+    Returns (red-flag message or None, intent); the intent only matters when there is no red flag.
+    """
+    best_flag: Optional[int] = None
+    best_rule: Optional[int] = None
+    for m in _MESSAGE_RX.finditer(message or ""):
+        kind, i = m.lastgroup[0], int(m.lastgroup[1:])
+        if kind == "f":
+            if best_flag is None or i < best_flag:
+                best_flag = i
+                if best_flag == 0:
+                    break
+        elif best_rule is None or i < best_rule:
+            best_rule = i
+
+    flag = RED_FLAG_PATTERNS[best_flag][1] if best_flag is not None else None
+    intent = dict(_RULES[best_rule][1]) if best_rule is not None else dict(_FALLBACK_INTENT)
+    return flag, intent
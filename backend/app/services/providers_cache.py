@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models import Location, Provider, ProviderType
+
+
+@dataclass(frozen=True)
+class ProviderRecord:
+    id: str
+    name: str
+    provider_type: str
+    location_id: str
+    accepts_virtual: bool
+    # pre-normalized for provider_search
+    name_lower: str
+    last_name_lower: str
+
+
+@dataclass(frozen=True)
+class LocationRecord:
+    id: str
+    name: str
+    city: str
+    state: str
+
+
+class LastNameIndex:
+    """
+    Typeahead index over provider last names (lowercased).
+    - prefix(): bisect over the sorted names instead of a startswith scan
+    - close(): rapidfuzz fallback for misspellings
+    """
+
+    def __init__(self, providers: List[ProviderRecord]):
+        entries = sorted((p.last_name_lower, p.id) for p in providers)
+        self._names = [name for name, _ in entries]
+        self._ids = [pid for _, pid in entries]
+        self._choices = sorted(set(self._names))
+
+    def prefix(self, query: str) -> Set[str]:
+        """Ids of providers whose last name starts with query."""
+        ids: Set[str] = set()
+        i = bisect_left(self._names, query)
+        while i < len(self._names) and self._names[i].startswith(query):
+            ids.add(self._ids[i])
+            i += 1
+        return ids
+
+    def close(self, query: str, limit: int = 5, score_cutoff: float = 60) -> Set[str]:
+        """Last names similar to query, best `limit` at or above score_cutoff (0-100)."""
+        matches = process.extract(query, self._choices, scorer=fuzz.ratio, score_cutoff=score_cutoff, limit=limit)
+        return {name for name, _, _ in matches}
+
+
+@dataclass(frozen=True)
+class ProviderDirectory:
+    providers: List[ProviderRecord]
+    providers_by_id: Dict[str, ProviderRecord]
+    providers_by_type: Dict[str, List[ProviderRecord]]
+    # keyed by provider_type; None covers every provider
+    last_name_indexes: Dict[Optional[str], LastNameIndex]
+
+
+# Locations are immutable seed data, loaded once at startup by load_locations().
+LOCATIONS: Dict[str, LocationRecord] = {}
+
+# Providers are seed data too; writers call bump_version() so readers reload.
+_version = 0
+_cached: Optional[Tuple[int, ProviderDirectory]] = None
+
+
+# Bumped after every booking; keys memoized responses that embed next-available times.
+_booking_version = 0
+
+
+def bump_version() -> None:
+    global _version
+    _version += 1
+
+
+def bump_booking_version() -> None:
+    global _booking_version
+    _booking_version += 1
+
+
+def booking_version() -> int:
+    return _booking_version
+
+
+async def _load_directory(session: AsyncSession) -> ProviderDirectory:
+    # Column projections: rows come back as tuples, no ORM instances are hydrated
+    provider_rows = (await session.exec(
+        select(Provider.id, Provider.name, Provider.provider_type, Provider.location_id, Provider.accepts_virtual)
+    )).all()
+
+    providers = [
+        ProviderRecord(
+            id=pid,
+            name=name,
+            provider_type=ProviderType(provider_type).value,
+            location_id=location_id,
+            accepts_virtual=accepts_virtual,
+            name_lower=name.lower(),
+            last_name_lower=name.split()[-1].lower(),
+        )
+        for pid, name, provider_type, location_id, accepts_virtual in provider_rows
+    ]
+
+    by_type: Dict[str, List[ProviderRecord]] = {}
+    for p in providers:
+        by_type.setdefault(p.provider_type, []).append(p)
+
+    return ProviderDirectory(
+        providers=providers,
+        providers_by_id={p.id: p for p in providers},
+        providers_by_type=by_type,
+        last_name_indexes={
+            None: LastNameIndex(providers),
+            **{t: LastNameIndex(ps) for t, ps in by_type.items()},
+        },
+    )
+
+
+async def load_locations(session: AsyncSession) -> None:
+    rows = (await session.exec(select(Location.id, Location.name, Location.city, Location.state))).all()
+    LOCATIONS.clear()
+    LOCATIONS.update((row[0], LocationRecord(*row)) for row in rows)
+
+
+async def get_directory(session: AsyncSession) -> ProviderDirectory:
+    """
+    In-process snapshot of the provider directory.
+    Reloaded from the database only after bump_version().
+    """
+    global _cached
+    version = _version
+    if _cached is None or _cached[0] != version:
+        _cached = (version, await _load_directory(session))
+    return _cached[1]
@@ -1,5 +1,5 @@
 import re
-from typing import Optional
+from typing import Optional, Sequence
 
 RED_FLAG_PATTERNS = [
     (re.compile(r"\b(chest pain|pressure in chest|tightness in chest)\b", re.I),
@@ -10,8 +10,32 @@ RED_FLAG_PATTERNS = [
      "Possible stroke symptoms can be an emergency."),
 ]
 
+
+def fused_alternation(prefix: str, patterns: Sequence[re.Pattern]) -> str:
+    """
+    One alternative per compiled pattern, named <prefix><index>. Each sits in a lookahead, so
+    finditer tries every start position and overlapping matches are all seen, exactly as when
+    the patterns are searched one by one.
+    """
+    return "|".join(f"(?=(?P<{prefix}{i}>{rx.pattern}))" for i, rx in enumerate(patterns))
+
+
+def lowest_match(rx: re.Pattern, text: str) -> Optional[int]:
+    """Index of the earliest-listed pattern of a fused_alternation() that matches anywhere in text."""
+    best: Optional[int] = None
+    for m in rx.finditer(text):
+        i = int(m.lastgroup[1:])
+        if best is None or i < best:
+            best = i
+            if best == 0:
+                break
+    return best
+
+
+# All patterns fused so the message is scanned once; the lowest index found still wins.
+_RED_FLAG_RX = re.compile(fused_alternation("f", [rx for rx, _ in RED_FLAG_PATTERNS]), re.I)
+
+
 def detect_red_flags(text: str) -> Optional[str]:
-    for rx, msg in RED_FLAG_PATTERNS:
-        if rx.search(text or ""):
-            return msg
-    return None
+    best = lowest_match(_RED_FLAG_RX, text or "")
+    return RED_FLAG_PATTERNS[best][1] if best is not None else None
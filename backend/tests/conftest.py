@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Runs before any test module imports app.db: point the app at a throwaway database
+# so tests neither read nor fill up the development ./app/app.db.
+_DB_DIR = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_DIR.name}/test.db"
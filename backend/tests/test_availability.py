@@ -44,3 +44,38 @@ def test_availability_slots_are_sorted_by_start_then_provider():
 
         sorted_slots = sorted(slots, key=lambda s: (s["start"], s["provider_id"]))
         assert slots == sorted_slots
+
+
+def test_availability_revalidates_with_etag():
+    with TestClient(app) as client:
+        params = {
+            "provider_type": "cardiology",
+            "start_date": "2031-09-01",
+            "days": 1,
+            "mode": "in_person",
+        }
+        first = client.get("/api/availability", params=params)
+        assert first.status_code == 200
+
+        again = client.get("/api/availability", params=params, headers={"If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
+
+
+def test_availability_rejects_unbounded_day_ranges():
+    with TestClient(app) as client:
+        response = client.get("/api/availability", params={"provider_type": "primary_care", "days": 20000})
+        assert response.status_code == 422
+
+
+def test_availability_for_unknown_provider_type_is_empty_and_revalidates():
+    with TestClient(app) as client:
+        first = client.get("/api/availability", params={"provider_type": "podiatry"})
+        assert first.status_code == 200
+        assert first.json() == {"slots": []}
+
+        again = client.get(
+            "/api/availability",
+            params={"provider_type": "podiatry"},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        assert again.status_code == 304
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from app.db import _upgrade_schema
+
+# Schema as created by versions with a text status and no unique slot indexes
+LEGACY_DDL = [
+    """CREATE TABLE appointment (
+        id VARCHAR NOT NULL PRIMARY KEY, provider_id VARCHAR NOT NULL, location_id VARCHAR NOT NULL,
+        start DATETIME NOT NULL, "end" DATETIME NOT NULL, mode VARCHAR(9) NOT NULL,
+        visit_reason_code VARCHAR NOT NULL, patient_first_name VARCHAR NOT NULL,
+        patient_last_name VARCHAR NOT NULL, patient_dob DATE NOT NULL, patient_phone VARCHAR NOT NULL,
+        patient_email VARCHAR, notes VARCHAR, status VARCHAR NOT NULL, created_at DATETIME NOT NULL)""",
+    "CREATE INDEX idx_appt_provider_start_mode ON appointment (provider_id, start, mode)",
+    """CREATE TABLE slothold (
+        id VARCHAR NOT NULL PRIMARY KEY, provider_id VARCHAR NOT NULL, location_id VARCHAR NOT NULL,
+        start DATETIME NOT NULL, "end" DATETIME NOT NULL, mode VARCHAR(9) NOT NULL,
+        visit_reason_code VARCHAR NOT NULL, expires_at DATETIME NOT NULL, consumed_at DATETIME,
+        created_at DATETIME NOT NULL)""",
+    "CREATE INDEX idx_hold_provider_start_mode ON slothold (provider_id, start, mode)",
+]
+
+SLOT = "'prov_3', 'loc_2', '2031-09-01 09:00:00.000000', '2031-09-01 09:30:00.000000', 'in_person', 'DERM_RASH'"
+
+
+def _legacy_engine(tmp_path, appointment_ids):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for ddl in LEGACY_DDL:
+            conn.exec_driver_sql(ddl)
+        for appt_id in appointment_ids:
+            conn.exec_driver_sql(
+                f"INSERT INTO appointment VALUES ('{appt_id}', {SLOT}, 'Ada', 'Lovelace', '1990-01-01', "
+                "'555-0100', NULL, NULL, 'confirmed', '2031-08-01 00:00:00.000000')"
+            )
+        conn.exec_driver_sql(f"INSERT INTO slothold VALUES ('hold_a', {SLOT}, '2031-08-01', '2031-08-01', '2031-08-01')")
+        conn.exec_driver_sql(f"INSERT INTO slothold VALUES ('hold_b', {SLOT}, '2031-08-01', NULL, '2031-08-02')")
+    return engine
+
+
+def test_upgrade_migrates_status_and_adds_unique_slot_indexes(tmp_path):
+    engine = _legacy_engine(tmp_path, ["appt_1"])
+    with engine.begin() as conn:
+        SQLModel.metadata.create_all(conn)
+        _upgrade_schema(conn)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT status, typeof(status) FROM appointment").all() == [(1, "integer")]
+        # the consumed hold is the one kept for the slot
+        assert conn.exec_driver_sql("SELECT id FROM slothold").all() == [("hold_a",)]
+        indexes = {name for (name,) in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"uq_appt_confirmed_slot", "uq_hold_provider_start_mode"} <= indexes
+
+
+def test_upgrade_refuses_a_double_booked_database(tmp_path):
+    engine = _legacy_engine(tmp_path, ["appt_1", "appt_2"])
+    with engine.begin() as conn:
+        SQLModel.metadata.create_all(conn)
+        with pytest.raises(RuntimeError, match="more than one confirmed booking"):
+            _upgrade_schema(conn)
+
+
+def test_app_starts_on_an_in_memory_database():
+    # DB_URL is read at import time, so start the app in a fresh interpreter
+    script = (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "with TestClient(app) as client:\n"
+        "    assert client.get('/api/providers').status_code == 200\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**os.environ, "DATABASE_URL": "sqlite+aiosqlite:///:memory:"},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,112 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from app.db import DB_URL
+from app.main import app
+
+
+def _first_open_slot(client, provider_type="dermatology"):
+    response = client.get(
+        "/api/availability",
+        params={
+            "provider_type": provider_type,
+            "start_date": "2031-09-01",  # Monday
+            "days": 14,
+            "mode": "in_person",
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["slots"][0]
+
+
+def _hold(client, slot):
+    return client.post(
+        "/api/holds",
+        json={
+            "session_id": "test-flow",
+            "provider_id": slot["provider_id"],
+            "start": slot["start"],
+            "mode": slot["mode"],
+            "visit_reason_code": "DERM_RASH",
+        },
+    )
+
+
+def _booking(hold_id):
+    return {
+        "session_id": "test-flow",
+        "hold_id": hold_id,
+        "patient_first_name": "Ada",
+        "patient_last_name": "Lovelace",
+        "patient_dob": "1990-01-01",
+        "patient_phone": "555-0100",
+    }
+
+
+def test_hold_then_book_blocks_the_slot():
+    with TestClient(app) as client:
+        slot = _first_open_slot(client)
+
+        hold = _hold(client, slot)
+        assert hold.status_code == 200
+
+        second = _hold(client, slot)
+        assert second.status_code == 409
+        assert second.json()["detail"] == "Slot is currently on hold"
+
+        booked = client.post("/api/appointments", json=_booking(hold.json()["hold_id"]))
+        assert booked.status_code == 200
+        assert booked.json()["status"] == "confirmed"
+
+        after = _hold(client, slot)
+        assert after.status_code == 409
+        assert after.json()["detail"] == "Slot already booked"
+
+        assert _first_open_slot(client) != slot
+
+
+def test_book_reports_a_slot_confirmed_without_a_hold_as_booked():
+    slot = {"provider_id": "prov_4", "start": "2031-09-02T09:00:00", "mode": "in_person"}
+    with TestClient(app) as client:
+        # an appointment that bypassed holds, e.g. written before holds were kept per slot
+        db = sqlite3.connect(make_url(DB_URL).database)
+        db.execute(
+            "INSERT INTO appointment VALUES ('appt_legacy', 'prov_4', 'loc_2', '2031-09-02 09:00:00.000000', "
+            "'2031-09-02 09:30:00.000000', 'in_person', 'MSK_PAIN', 'Ada', 'Lovelace', '1990-01-01', "
+            "'555-0100', NULL, NULL, 1, '2031-08-01 00:00:00.000000')"
+        )
+        db.commit()
+        db.close()
+
+        hold = _hold(client, slot)
+        assert hold.status_code == 200
+
+        booked = client.post("/api/appointments", json=_booking(hold.json()["hold_id"]))
+        assert booked.status_code == 409
+        assert booked.json()["detail"] == "Slot already booked"
+
+
+def test_search_intent_persists_its_audit_rows():
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/search-intent",
+            json={"session_id": "test-audit-rows", "message": "I have an itchy rash"},
+        )
+        assert response.status_code == 200
+
+    db = sqlite3.connect(make_url(DB_URL).database)
+    events = db.execute(
+        "SELECT event_type FROM conversationevent WHERE session_id = 'test-audit-rows' ORDER BY event_type"
+    ).fetchall()
+    recommendations = db.execute(
+        "SELECT visit_reason_code FROM recommendationaudit WHERE session_id = 'test-audit-rows'"
+    ).fetchall()
+    db.close()
+
+    assert events == [("assistant_message",), ("user_message",)]
+    assert recommendations == [("DERM_RASH",)]
@@ -0,0 +1,60 @@
+import difflib
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from app.main import app
+from app.services.providers_cache import LastNameIndex, ProviderRecord
+
+
+def test_booking_invalidates_memoized_provider_directory():
+    params = {"provider_type": "cardiology", "start_date": "2031-10-06", "days": 1, "mode": "in_person"}  # Monday
+    with TestClient(app) as client:
+        before = client.get("/api/providers", params=params)
+        assert before.status_code == 200
+        first = before.json()["providers"][0]
+
+        hold = client.post(
+            "/api/holds",
+            json={
+                "session_id": "test-providers",
+                "provider_id": first["provider_id"],
+                "start": first["next_available_start"],
+                "mode": first["next_available_mode"],
+                "visit_reason_code": "GENERIC_TRIAGE",
+            },
+        )
+        assert hold.status_code == 200
+        booked = client.post(
+            "/api/appointments",
+            json={
+                "session_id": "test-providers",
+                "hold_id": hold.json()["hold_id"],
+                "patient_first_name": "Ada",
+                "patient_last_name": "Lovelace",
+                "patient_dob": "1990-01-01",
+                "patient_phone": "555-0100",
+            },
+        )
+        assert booked.status_code == 200
+
+        # the old ETag no longer matches: a fresh body comes back, not a 304
+        after = client.get("/api/providers", params=params, headers={"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == 200
+        assert after.headers["ETag"] != before.headers["ETag"]
+        same_provider = next(p for p in after.json()["providers"] if p["provider_id"] == first["provider_id"])
+        assert same_provider["next_available_start"] > first["next_available_start"]
+
+
+def test_last_name_fallback_matches_difflib():
+    last_names = ["patel", "lee", "kim", "ross", "garcia", "chen", "nair", "ortiz", "schultz", "rahman", "smith", "johnson"]
+    index = LastNameIndex([
+        ProviderRecord(id=f"prov_{i}", name=name, provider_type="primary_care", location_id="loc_1",
+                       accepts_virtual=True, name_lower=name, last_name_lower=name)
+        for i, name in enumerate(last_names)
+    ])
+
+    for query in ["jonson", "smyth", "patell", "garsia", "shultz", "orts", "rahmen", "kym", "xyz"]:
+        assert index.close(query) == set(difflib.get_close_matches(query, last_names, n=5, cutoff=0.6))
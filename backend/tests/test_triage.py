@@ -0,0 +1,57 @@
+import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from app.services.intent import classify_message, map_to_intent
+from app.services.triage import detect_red_flags, fused_alternation, lowest_match
+
+
+def test_detect_red_flags_matches_phrase_case_insensitively():
+    assert detect_red_flags("I have Chest Pain since this morning") == "Chest pain can be an emergency."
+
+
+def test_detect_red_flags_prefers_earlier_rule_regardless_of_position():
+    msg = detect_red_flags("slurred speech and now shortness of breath and chest pain")
+    assert msg == "Chest pain can be an emergency."
+
+
+def test_detect_red_flags_requires_word_boundaries():
+    assert detect_red_flags("strokes of luck") is None
+    assert detect_red_flags("") is None
+    assert detect_red_flags(None) is None  # type: ignore[arg-type]
+
+
+def test_map_to_intent_prefers_earlier_rule_regardless_of_position():
+    intent = map_to_intent("itchy rash and a fever")
+    assert intent["visit_reason_code"] == "URTI_SORE_THROAT"
+
+
+def test_map_to_intent_falls_back_to_generic_triage():
+    intent = map_to_intent("I'd like to talk to someone")
+    assert intent["visit_reason_code"] == "GENERIC_TRIAGE"
+    assert intent["confidence"] == "low"
+
+
+def test_classify_message_agrees_with_separate_scans():
+    for text in [
+        "itchy rash and a fever",
+        "fever and now trouble breathing",
+        "slurred speech and now shortness of breath and chest pain",
+        "I need a checkup for my back pain",
+        "strokes of luck",
+        "",
+    ]:
+        flag, intent = classify_message(text)
+        assert flag == detect_red_flags(text)
+        if flag is None:
+            assert intent == map_to_intent(text)
+
+
+def test_fused_scan_sees_matches_overlapped_by_lower_priority_ones():
+    # "back pain" (index 1) starts first and overlaps "pain in chest" (index 0)
+    patterns = [re.compile(r"\bpain in chest\b"), re.compile(r"\bback pain\b")]
+    rx = re.compile(fused_alternation("r", patterns), re.I)
+    assert lowest_match(rx, "back pain in chest") == 0
+    assert lowest_match(rx, "back pain") == 1
+    assert lowest_match(rx, "no match") is None